@@ -9,14 +9,190 @@ Note: You need a Supadata API key to use this script.
 Get your API key from: https://supadata.ai/
 """
 
+import argparse
 import sys
 import re
 import os
 import csv
+import functools
+import logging
+import logging.handlers
+import queue
+import threading
 import time
-from typing import Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from supadata import Supadata, SupadataError
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Number of transcripts fetched concurrently
+MAX_WORKERS = 8
+
+# Adaptive request rate (requests per second): halved on every 429 response,
+# raised by RATE_INCREASE_STEP after RATE_INCREASE_AFTER successes, up to RATE_LIMIT
+RATE_LIMIT = 2.0
+MIN_RATE_LIMIT = 0.1
+RATE_INCREASE_STEP = 1.0
+RATE_INCREASE_AFTER = 10
+
+# Requests that may start back to back after an idle period; kept at 1 so the
+# request rate never exceeds RATE_LIMIT, whatever the worker count
+RATE_BURST = 1
+
+# Transient API failures (rate limiting, server errors) are retried with backoff
+MAX_FETCH_ATTEMPTS = 5
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_ERROR_CODES = {'limit-exceeded', 'internal-error'}
+
+# Failed connects and dropped connections are first retried inside the HTTP
+# connection pool; HTTP status codes are left to the retry logic above
+CONNECTION_RETRIES = 3
+
+# Matches the video ID in watch, short, embed and /v/ style YouTube URLs
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/|youtube\.com/(?:embed|v)/)([a-zA-Z0-9_-]{11})'
+)
+
+# Header written at the top of every transcript file
+TRANSCRIPT_HEADER = (
+    "Video ID: {video_id}\n"
+    "URL: {url}\n"
+    "Description: {description}\n"
+    "Language: {language}\n"
+    + "-" * 50 + "\n\n"
+)
+
+# Tracking files for completed and failed URLs
+COMPLETED_FILE = "youtube_url_completed.txt"
+FAILED_FILE = "youtube_url_failed.txt"
+
+# Tracking records are batched and checkpointed (one writev() plus fdatasync())
+# every TRACKING_FLUSH_RECORDS records or TRACKING_FLUSH_INTERVAL seconds, so a
+# crash loses at most one batch
+TRACKING_FLUSH_RECORDS = 16
+TRACKING_FLUSH_INTERVAL = 5.0
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter whose refill rate adapts to API throttling.
+    
+    Workers call acquire() before every API request. Tokens accrue on the
+    monotonic clock regardless of how long requests take, so the spacing
+    is measured from the start of one request to the start of the next and
+    request latency overlaps the wait instead of adding to it.
+    
+    The refill rate is halved when the API answers 429 and raised
+    additively after a run of successful requests (AIMD), so it settles
+    near the real API limit. Each cut starts a new generation; 429s for
+    requests issued before the latest cut are ignored, so one throttling
+    episode seen by several workers only halves the rate once.
+    """
+    
+    def __init__(self, rate: float = RATE_LIMIT, capacity: int = RATE_BURST,
+                 min_rate: float = MIN_RATE_LIMIT, increase_after: int = RATE_INCREASE_AFTER):
+        self._condition = threading.Condition()
+        self.rate = rate
+        self.max_rate = rate
+        # Never let a cut raise a rate that already starts below the floor
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity
+        self.increase_after = increase_after
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._successes = 0
+        self._generation = 0
+    
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update (caller holds the lock)."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self) -> int:
+        """Block until a token is available, then take it and return the current generation."""
+        with self._condition:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return self._generation
+                self._condition.wait((1 - self._tokens) / self.rate)
+    
+    def multiplicative_decrease(self, factor: float = 0.5, generation: Optional[int] = None) -> bool:
+        """
+        Cut the refill rate after a 429 and drop any saved-up burst.
+        
+        Args:
+            factor (float): Multiplier applied to the current rate
+            generation (Optional[int]): Value returned by acquire() for the throttled
+                request; the cut is skipped if the rate was already cut since then
+                
+        Returns:
+            bool: True if the rate was cut
+        """
+        with self._condition:
+            if generation is not None and generation != self._generation:
+                return False
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * factor)
+            self._tokens = min(self._tokens, 0.0)
+            self._successes = 0
+            self._generation += 1
+            return True
+    
+    def additive_increase(self, step: float = RATE_INCREASE_STEP) -> None:
+        """Raise the refill rate by `step` tokens per second, up to the configured limit."""
+        with self._condition:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + step)
+            self._condition.notify_all()
+    
+    def record_success(self) -> None:
+        """Count a successful request; every `increase_after` successes raise the rate."""
+        with self._condition:
+            self._successes += 1
+            if self._successes < self.increase_after:
+                return
+            self._successes = 0
+        self.additive_increase()
+
+
+def setup_logging(quiet: bool = False) -> logging.handlers.QueueListener:
+    """
+    Route log records through a queue to a single stdout writer thread.
+    
+    Worker threads only enqueue records, so they never contend for stdout.
+    The returned listener must be stopped to flush the remaining records.
+    
+    Args:
+        quiet (bool): Only show warnings and errors
+    """
+    log_queue = queue.SimpleQueue()
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.WARNING if quiet else logging.INFO)
+    
+    listener.start()
+    return listener
 
 
 def load_environment():
@@ -28,42 +204,70 @@ def load_environment():
     api_key = os.getenv('SUPADATA_API_KEY')
     
     if not api_key:
-        print("Error: SUPADATA_API_KEY not found in environment variables.")
-        print("Please create a .env file with your API key:")
-        print("SUPADATA_API_KEY=your_actual_api_key_here")
-        print("\nOr set the environment variable:")
-        print("export SUPADATA_API_KEY=your_actual_api_key_here")
+        logger.error(
+            "Error: SUPADATA_API_KEY not found in environment variables.\n"
+            "Please create a .env file with your API key:\n"
+            "SUPADATA_API_KEY=your_actual_api_key_here\n"
+            "\nOr set the environment variable:\n"
+            "export SUPADATA_API_KEY=your_actual_api_key_here"
+        )
         sys.exit(1)
     
     return api_key
 
 
+def create_client(api_key: str, pool_size: int = MAX_WORKERS) -> Supadata:
+    """
+    Build the Supadata client shared by all workers.
+    
+    The SDK sends requests through one requests.Session; its connection pool
+    is sized to the worker count so every worker keeps a warm keep-alive
+    connection instead of reconnecting after the pool overflows. Network
+    errors are retried by the pool itself, while 429/5xx responses are
+    passed through so fetch_transcript() can slow the rate limiter down.
+    """
+    retries = Retry(
+        total=CONNECTION_RETRIES,
+        status=0,
+        backoff_factor=1,
+        allowed_methods=frozenset({'GET'}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+    
+    client = Supadata(api_key=api_key)
+    client.session.mount('https://', adapter)
+    return client
+
+
+@functools.lru_cache(maxsize=1)
 def ensure_transcripts_folder():
-    """Ensure the transcripts folder exists."""
+    """Ensure the transcripts folder exists; the result is cached for the rest of the run."""
     transcripts_dir = "transcripts"
     try:
-        if not os.path.exists(transcripts_dir):
-            os.makedirs(transcripts_dir, exist_ok=True)
-            print(f"Created transcripts folder: {transcripts_dir}")
-        else:
-            print(f"Using existing transcripts folder: {transcripts_dir}")
+        try:
+            os.makedirs(transcripts_dir)
+            logger.info(f"Created transcripts folder: {transcripts_dir}")
+        except FileExistsError:
+            if not os.path.isdir(transcripts_dir):
+                raise
         return transcripts_dir
     except Exception as e:
-        print(f"Error creating transcripts folder: {e}")
+        logger.error(f"Error creating transcripts folder: {e}")
         # Try to create in current directory as fallback
         fallback_dir = "transcripts_fallback"
         try:
             os.makedirs(fallback_dir, exist_ok=True)
-            print(f"Created fallback folder: {fallback_dir}")
+            logger.info(f"Created fallback folder: {fallback_dir}")
             return fallback_dir
         except Exception as fallback_e:
-            print(f"Critical error: Could not create any transcripts folder: {fallback_e}")
+            logger.critical(f"Critical error: Could not create any transcripts folder: {fallback_e}")
             raise
 
 
 def load_completed_urls() -> set:
     """Load already completed YouTube URLs from file."""
-    completed_file = "youtube_url_completed.txt"
+    completed_file = COMPLETED_FILE
     completed_urls = set()
     
     if os.path.exists(completed_file):
@@ -73,16 +277,16 @@ def load_completed_urls() -> set:
                     url = line.strip()
                     if url:
                         completed_urls.add(url)
-            print(f"Loaded {len(completed_urls)} completed URLs from {completed_file}")
+            logger.info(f"Loaded {len(completed_urls)} completed URLs from {completed_file}")
         except Exception as e:
-            print(f"Warning: Could not load completed URLs: {e}")
+            logger.warning(f"Warning: Could not load completed URLs: {e}")
     
     return completed_urls
 
 
 def load_failed_urls() -> set:
     """Load failed YouTube URLs from file."""
-    failed_file = "youtube_url_failed.txt"
+    failed_file = FAILED_FILE
     failed_urls = set()
     
     if os.path.exists(failed_file):
@@ -94,71 +298,267 @@ def load_failed_urls() -> set:
                     url = parts[0] if parts else ""
                     if url:
                         failed_urls.add(url)
-            print(f"Loaded {len(failed_urls)} failed URLs from {failed_file}")
+            logger.info(f"Loaded {len(failed_urls)} failed URLs from {failed_file}")
         except Exception as e:
-            print(f"Warning: Could not load failed URLs: {e}")
+            logger.warning(f"Warning: Could not load failed URLs: {e}")
     
     return failed_urls
 
 
-def save_completed_url(url: str) -> None:
-    """Save a completed YouTube URL to the tracking file."""
-    completed_file = "youtube_url_completed.txt"
-    
-    try:
-        with open(completed_file, 'a', encoding='utf-8') as f:
-            f.write(f"{url}\n")
-        print(f"Saved completed URL: {url}")
-    except Exception as e:
-        print(f"Warning: Could not save completed URL: {e}")
+# fdatasync() skips metadata such as mtime; fall back to fsync() where it is missing
+_sync_data = getattr(os, 'fdatasync', os.fsync)
 
 
-def save_failed_url(url: str, reason: str = "Unknown error") -> None:
-    """Save a failed YouTube URL to the tracking file with reason."""
-    failed_file = "youtube_url_failed.txt"
+def _write_all(fd: int, chunks: List[bytes]) -> None:
+    """Write byte chunks to a file descriptor, gathered into one writev() where available."""
+    total = sum(len(chunk) for chunk in chunks)
+    written = os.writev(fd, chunks) if hasattr(os, 'writev') else 0
+    if written < total:
+        remaining = memoryview(b"".join(chunks))[written:]
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+
+
+class TrackingLog:
+    """
+    Append completed and failed URLs to their tracking files.
     
-    try:
-        with open(failed_file, 'a', encoding='utf-8') as f:
-            f.write(f"{url}\t{reason}\n")
-        print(f"Saved failed URL: {url} - Reason: {reason}")
-    except Exception as e:
-        print(f"Warning: Could not save failed URL: {e}")
+    Both files are opened once for the whole run. Records from worker
+    threads are queued under a lock and written in batches, so many URLs
+    cost a single write system call. Each batch is synced to disk, which
+    bounds what a crash can lose; close() flushes whatever is left.
+    """
+    
+    def __init__(self, completed_file: str = COMPLETED_FILE, failed_file: str = FAILED_FILE):
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        self._lock = threading.Lock()
+        self._completed_fd = os.open(completed_file, flags, 0o644)
+        try:
+            self._failed_fd = os.open(failed_file, flags, 0o644)
+        except OSError:
+            os.close(self._completed_fd)
+            raise
+        self._pending = {self._completed_fd: [], self._failed_fd: []}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+    
+    def _append(self, fd: int, record: str) -> None:
+        """Queue a record and flush the batch once it is large or old enough."""
+        with self._lock:
+            self._pending[fd].append(record.encode('utf-8'))
+            self._pending_count += 1
+            if (self._pending_count >= TRACKING_FLUSH_RECORDS
+                    or time.monotonic() - self._last_flush >= TRACKING_FLUSH_INTERVAL):
+                self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        """Write and sync all queued records (caller holds the lock)."""
+        for fd, chunks in self._pending.items():
+            if chunks:
+                _write_all(fd, chunks)
+                _sync_data(fd)
+                chunks.clear()
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+    
+    def save_completed(self, url: str) -> None:
+        """Save a completed YouTube URL to the tracking file."""
+        try:
+            self._append(self._completed_fd, f"{url}\n")
+            logger.info(f"Saved completed URL: {url}")
+        except Exception as e:
+            logger.warning(f"Warning: Could not save completed URL: {e}")
+    
+    def save_failed(self, url: str, reason: str = "Unknown error") -> None:
+        """Save a failed YouTube URL to the tracking file with reason."""
+        try:
+            self._append(self._failed_fd, f"{url}\t{reason}\n")
+            logger.info(f"Saved failed URL: {url} - Reason: {reason}")
+        except Exception as e:
+            logger.warning(f"Warning: Could not save failed URL: {e}")
+    
+    def flush(self) -> None:
+        """Write any queued records to the tracking files and sync them to disk."""
+        with self._lock:
+            self._flush_locked()
+    
+    def close(self) -> None:
+        """Flush and close both tracking files."""
+        with self._lock:
+            try:
+                self._flush_locked()
+            finally:
+                os.close(self._completed_fd)
+                os.close(self._failed_fd)
+    
+    def __enter__(self) -> "TrackingLog":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
-def read_csv_urls(csv_file: str = "youtube_url.csv") -> List[Tuple[str, str, str]]:
+def read_csv_urls(csv_file: str = "youtube_url.csv") -> Iterator[Tuple[str, str, str]]:
     """
-    Read YouTube URLs from CSV file.
+    Read YouTube URLs from CSV file, one row at a time.
     
     Args:
         csv_file (str): Path to CSV file
         
-    Returns:
-        List[Tuple[str, str, str]]: List of (video_id, url, description) tuples
+    Yields:
+        Tuple[str, str, str]: (video_id, url, description) for each valid row
     """
-    urls = []
-    
     if not os.path.exists(csv_file):
-        print(f"Error: CSV file '{csv_file}' not found")
-        return urls
+        logger.error(f"Error: CSV file '{csv_file}' not found")
+        return
     
+    count = 0
     try:
         with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
+            # The csv module already removes the quotes around each field
+            reader = csv.reader(f, quoting=csv.QUOTE_MINIMAL)
             for row_num, row in enumerate(reader, 1):
                 if len(row) >= 2:
-                    video_id = row[0].strip('"')
-                    url = row[1].strip('"')
-                    description = row[2].strip('"') if len(row) > 2 else ""
-                    urls.append((video_id, url, description))
+                    video_id, url, *rest = row
+                    description = rest[0] if rest else ""
+                    count += 1
+                    yield video_id, url, description
                 else:
-                    print(f"Warning: Row {row_num} has insufficient columns: {row}")
+                    logger.warning(f"Warning: Row {row_num} has insufficient columns: {row}")
         
-        print(f"Loaded {len(urls)} URLs from CSV file")
-        return urls
+        logger.info(f"Loaded {count} URLs from CSV file")
         
     except Exception as e:
-        print(f"Error reading CSV file: {e}")
-        return urls
+        logger.error(f"Error reading CSV file: {e}")
+
+
+def write_file_atomic(filename: str, payload: bytes) -> None:
+    """
+    Write a file so that it is either complete or absent, never half-written.
+    
+    The payload goes to a temporary file in the same folder with a single
+    write, is synced to disk, and is then renamed over the target.
+    """
+    tmp_filename = os.path.join(
+        os.path.dirname(filename),
+        f".{os.path.basename(filename)}.{threading.get_ident()}.tmp",
+    )
+    fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            _write_all(fd, [payload])
+            _sync_data(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp_filename)
+        except OSError:
+            pass
+        raise
+
+
+def transcript_filename(transcripts_dir: str, video_id: str, language: str) -> str:
+    """Return the transcript path for a video in a given language."""
+    return os.path.join(transcripts_dir, f"{video_id}.{language}.txt")
+
+
+def has_cached_transcript(filename: str, video_id: str, language: Optional[str] = None) -> bool:
+    """
+    Check whether a transcript file was already saved by a previous run.
+    
+    Args:
+        filename (str): Path returned by transcript_filename()
+        video_id (str): Video ID expected in the file header
+        language (Optional[str]): Language expected in the file header, if it
+            is not already implied by the filename
+        
+    Returns:
+        bool: True if the file is non-empty and starts with a valid header
+    """
+    try:
+        if os.path.getsize(filename) == 0:
+            return False
+        # Compare bytes so a file with a non-UTF-8 description can't abort the run
+        with open(filename, 'rb') as f:
+            if f.readline().rstrip(b'\n') != f"Video ID: {video_id}".encode('utf-8'):
+                return False
+            if language is None:
+                return True
+            
+            # Look for the Language line before the header separator
+            separator = b"-" * 50
+            language_line = f"Language: {language}".encode('utf-8')
+            for line in f:
+                line = line.rstrip(b'\n')
+                if line == language_line:
+                    return True
+                if line == separator:
+                    return False
+            return False
+    except OSError:
+        return False
+
+
+def list_saved_video_ids(transcripts_dir: str, language: str) -> set:
+    """
+    Find videos that already have a non-empty transcript in the given language.
+    
+    A single directory scan replaces one stat() call per CSV row. Files saved
+    by older versions as <video_id>.txt are renamed to <video_id>.<language>.txt
+    when their header shows the requested language. Temporary files left
+    behind by write_file_atomic() when a run was killed are deleted.
+    
+    Args:
+        transcripts_dir (str): Folder where transcripts are saved
+        language (str): Language code for transcripts
+        
+    Returns:
+        set: Video IDs with a saved transcript file
+    """
+    suffix = f".{language}.txt"
+    video_ids = set()
+    legacy_video_ids = []
+    stale_tmp_files = []
+    
+    try:
+        with os.scandir(transcripts_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") and entry.name.endswith(".tmp"):
+                    stale_tmp_files.append(entry.path)
+                    continue
+                if not entry.name.endswith(".txt") or not entry.is_file() or entry.stat().st_size == 0:
+                    continue
+                if entry.name.endswith(suffix):
+                    video_ids.add(entry.name[:-len(suffix)])
+                elif "." not in entry.name[:-len(".txt")]:
+                    legacy_video_ids.append(entry.name[:-len(".txt")])
+    except OSError as e:
+        logger.warning(f"Warning: Could not scan transcripts folder: {e}")
+    
+    # No worker is running yet, so any temporary file is from an interrupted run
+    for tmp_filename in stale_tmp_files:
+        try:
+            os.unlink(tmp_filename)
+            logger.info(f"Removed incomplete transcript file: {tmp_filename}")
+        except OSError as e:
+            logger.warning(f"Warning: Could not remove incomplete transcript file {tmp_filename}: {e}")
+    
+    # Migrate transcripts saved before the language was part of the filename
+    for video_id in legacy_video_ids:
+        legacy_filename = os.path.join(transcripts_dir, f"{video_id}.txt")
+        if video_id in video_ids or not has_cached_transcript(legacy_filename, video_id, language):
+            continue
+        filename = transcript_filename(transcripts_dir, video_id, language)
+        try:
+            os.replace(legacy_filename, filename)
+            logger.info(f"Renamed legacy transcript {legacy_filename} to {filename}")
+            video_ids.add(video_id)
+        except OSError as e:
+            logger.warning(f"Warning: Could not rename legacy transcript {legacy_filename}: {e}")
+    
+    return video_ids
 
 
 def extract_video_id(url: str) -> Optional[str]:
@@ -171,208 +571,328 @@ def extract_video_id(url: str) -> Optional[str]:
     Returns:
         Optional[str]: Video ID if found, None otherwise
     """
-    # Handle various YouTube URL formats
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/v\/([a-zA-Z0-9_-]{11})'
-    ]
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def http_status(exc: BaseException) -> Optional[int]:
+    """Return the HTTP status code behind a failed request, if known."""
+    # The SDK raises SupadataError from the underlying HTTPError when the body is JSON
+    http_error = exc.__cause__ if isinstance(exc, SupadataError) else exc
+    response = getattr(http_error, 'response', None)
+    return response.status_code if response is not None else None
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    Decide whether a failed transcript request is worth retrying.
+    
+    Rate limiting (429), server errors (5xx) and network errors are retried;
+    anything else (invalid API key, missing transcript, ...) is permanent.
+    """
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    
+    status = http_status(exc)
+    if status is not None:
+        return status in RETRY_STATUS_CODES
+    
+    return isinstance(exc, SupadataError) and exc.error in RETRY_ERROR_CODES
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Return True if the API rejected the request for exceeding its rate limit."""
+    status = http_status(exc)
+    if status is not None:
+        return status == 429
     
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    return isinstance(exc, SupadataError) and exc.error == 'limit-exceeded'
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Report a transient failure before tenacity sleeps and retries."""
+    url = retry_state.args[1]
+    logger.warning(
+        f"Transient error for {url}: {retry_state.outcome.exception()}\n"
+        f"Retrying in {retry_state.next_action.sleep:.1f} seconds "
+        f"(attempt {retry_state.attempt_number + 1}/{MAX_FETCH_ATTEMPTS})..."
+    )
+
+
+@retry(
+    stop=stop_after_attempt(MAX_FETCH_ATTEMPTS),
+    wait=wait_exponential_jitter(multiplier=2, max=60),
+    retry=retry_if_exception(is_transient_error),
+    before_sleep=_log_retry,
+    reraise=True,
+)
+def fetch_transcript(client: Supadata, url: str, language: str = 'en',
+                     rate_limiter: Optional[TokenBucket] = None):
+    """Fetch a plain-text transcript, retrying transient API errors with backoff."""
+    if rate_limiter is None:
+        return client.youtube.transcript(url, lang=language, text=True)
     
-    return None
+    # Wait for a token before hitting the API, and feed the outcome back to the limiter
+    generation = rate_limiter.acquire()
+    try:
+        transcript = client.youtube.transcript(url, lang=language, text=True)
+    except Exception as e:
+        if is_rate_limited(e) and rate_limiter.multiplicative_decrease(generation=generation):
+            logger.warning(f"Rate limited by the API, slowing down to {rate_limiter.rate:.2f} requests/second")
+        raise
+    
+    rate_limiter.record_success()
+    return transcript
 
 
-def get_youtube_transcript(url: str, video_id: str, description: str, language: str = 'en') -> bool:
+def get_youtube_transcript(client: Supadata, transcripts_dir: str, tracking_log: TrackingLog,
+                           url: str, video_id: str, description: str, language: str = 'en',
+                           rate_limiter: Optional[TokenBucket] = None) -> bool:
     """
     Get transcript from a YouTube video using Supadata.
     """
     try:
-        # Load API key from environment
-        api_key = load_environment()
-        
-        # Ensure transcripts folder exists
-        transcripts_dir = ensure_transcripts_folder()
-        
-        # Initialize Supadata client
-        client = Supadata(api_key=api_key)
-        
-        print(f"\n{'='*60}")
-        print(f"Processing: {description}")
-        print(f"URL: {url}")
-        print(f"Video ID: {video_id}")
-        print(f"Language: {language}")
-        print(f"{'='*60}")
+        # One record per banner so lines from different workers don't interleave
+        logger.info(
+            f"\n{'='*60}\n"
+            f"Processing: {description}\n"
+            f"URL: {url}\n"
+            f"Video ID: {video_id}\n"
+            f"Language: {language}\n"
+            f"{'='*60}"
+        )
         
         # Get transcript directly (no metadata needed)
-        print("\nFetching transcript...")
+        logger.info("\nFetching transcript...")
         try:
             # Get transcript in plain text format
-            transcript = client.youtube.transcript(url, lang=language, text=True)
+            transcript = fetch_transcript(client, url, language, rate_limiter)
             
-            print("Transcript retrieved successfully!")
+            logger.info("Transcript retrieved successfully!")
             
-            # Save transcript to file in transcripts folder with simplified filename
-            filename = os.path.join(transcripts_dir, f"{video_id}.txt")
+            # Save transcript to file in transcripts folder
+            filename = transcript_filename(transcripts_dir, video_id, language)
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    # Write header with video information
-                    f.write(f"Video ID: {video_id}\n")
-                    f.write(f"URL: {url}\n")
-                    f.write(f"Description: {description}\n")
-                    f.write(f"Language: {language}\n")
-                    f.write("-" * 50 + "\n\n")
-                    
-                    # Write transcript content
-                    f.write(transcript.content if hasattr(transcript, 'content') else str(transcript))
+                # Header with video information followed by the transcript content
+                content = transcript.content if hasattr(transcript, 'content') else str(transcript)
+                header = TRANSCRIPT_HEADER.format(video_id=video_id, url=url,
+                                                  description=description, language=language)
+                payload = (header + content).encode('utf-8')
+                
+                write_file_atomic(filename, payload)
                 
-                print(f"Transcript saved to: {filename}")
+                logger.info(f"Transcript saved to: {filename}")
                 
                 # Mark as completed
-                save_completed_url(url)
+                tracking_log.save_completed(url)
                 return True
                 
             except Exception as e:
                 error_msg = f"File save error: {e}"
-                print(f"Error saving transcript to file: {e}")
-                save_failed_url(url, error_msg)
+                logger.error(f"Error saving transcript to file: {e}")
+                tracking_log.save_failed(url, error_msg)
                 return False
                 
         except SupadataError as e:
             error_msg = f"Supadata API error: {e}"
-            print(f"Supadata API error: {e}")
-            print("This might be due to:")
-            print("- Invalid API key")
-            print("- API rate limits")
-            print("- Video not having transcripts")
-            print("- Language not available")
-            save_failed_url(url, error_msg)
+            logger.error(
+                f"Supadata API error: {e}\n"
+                "This might be due to:\n"
+                "- Invalid API key\n"
+                "- API rate limits\n"
+                "- Video not having transcripts\n"
+                "- Language not available"
+            )
+            tracking_log.save_failed(url, error_msg)
             return False
             
         except Exception as e:
             error_msg = f"Transcript fetch error: {e}"
-            print(f"Error getting transcript: {e}")
-            save_failed_url(url, error_msg)
+            logger.error(f"Error getting transcript: {e}")
+            tracking_log.save_failed(url, error_msg)
             return False
             
     except Exception as e:
         error_msg = f"Unexpected error: {e}"
-        print(f"Unexpected error: {e}")
-        save_failed_url(url, error_msg)
+        logger.error(f"Unexpected error: {e}")
+        tracking_log.save_failed(url, error_msg)
         return False
 
 
-def process_csv_urls(csv_file: str = "youtube_url.csv", language: str = 'en') -> None:
+def process_csv_urls(client: Supadata, transcripts_dir: str, tracking_log: TrackingLog,
+                     csv_file: str = "youtube_url.csv", language: str = 'en',
+                     workers: int = MAX_WORKERS, rate: float = RATE_LIMIT) -> None:
     """
     Process all URLs from CSV file and fetch transcripts.
     
     Args:
+        client (Supadata): Supadata client shared by all workers
+        transcripts_dir (str): Folder where transcripts are saved
+        tracking_log (TrackingLog): Open tracking files for completed/failed URLs
         csv_file (str): Path to CSV file
         language (str): Language code for transcripts
+        workers (int): Number of transcripts fetched concurrently
+        rate (float): Maximum API requests per second
         """
-    # Ensure transcripts folder exists before starting processing
-    try:
-        transcripts_dir = ensure_transcripts_folder()
-        print(f"Transcripts will be saved to: {transcripts_dir}")
-    except Exception as e:
-        print(f"Critical error: Cannot proceed without transcripts folder: {e}")
-        return
-    
-    # Load URLs from CSV
-    urls = read_csv_urls(csv_file)
-    if not urls:
-        print("No URLs found in CSV file")
-        return
+    logger.info(f"Transcripts will be saved to: {transcripts_dir}")
     
     # Load already completed and failed URLs
     completed_urls = load_completed_urls()
     failed_urls = load_failed_urls()
     
-    # Filter out already completed and failed URLs
-    pending_urls = [(video_id, url, description) for video_id, url, description in urls 
-                    if url not in completed_urls and url not in failed_urls]
+    processed_urls = frozenset(completed_urls | failed_urls)
+    
+    # Transcripts saved by a previous run count as completed even if the
+    # tracking file lost them
+    saved_video_ids = list_saved_video_ids(transcripts_dir, language)
+    
+    # Stream URLs from CSV, keeping only those not already completed or failed
+    total_urls = 0
+    already_saved = 0
+    pending_urls = []
+    for video_id, url, description in read_csv_urls(csv_file):
+        total_urls += 1
+        if url in processed_urls:
+            continue
+        if (video_id in saved_video_ids
+                and has_cached_transcript(transcript_filename(transcripts_dir, video_id, language), video_id)):
+            tracking_log.save_completed(url)
+            already_saved += 1
+            continue
+        pending_urls.append((video_id, url, description))
+    
+    if not total_urls:
+        logger.info("No URLs found in CSV file")
+        return
     
     if not pending_urls:
-        print("All URLs have already been processed (completed or failed)!")
+        logger.info("All URLs have already been processed (completed, failed or already saved)!")
         return
     
-    print(f"Found {len(pending_urls)} URLs to process (out of {len(urls)} total)")
-    print(f"Already completed: {len(completed_urls)}")
-    print(f"Previously failed: {len(failed_urls)}")
+    logger.info(
+        f"Found {len(pending_urls)} URLs to process (out of {total_urls} total)\n"
+        f"Already completed: {len(completed_urls)}\n"
+        f"Previously failed: {len(failed_urls)}\n"
+        f"Transcripts already saved: {already_saved}"
+    )
+    
+    rate_limiter = TokenBucket(rate=rate)
     
-    # Process each URL
+    # Process URLs concurrently
     successful = 0
     failed = 0
     
-    for i, (video_id, url, description) in enumerate(pending_urls, 1):
-        print(f"\nProcessing {i}/{len(pending_urls)}: {description}")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(get_youtube_transcript, client, transcripts_dir, tracking_log,
+                            url, video_id, description, language, rate_limiter): description
+            for video_id, url, description in pending_urls
+        }
         
-        if get_youtube_transcript(url, video_id, description, language):
-            successful += 1
-        else:
-            failed += 1
-        
-        # Add 5-second pause after each URL to avoid API rate limits
-        if i < len(pending_urls):  # Don't pause after the last URL
-            print(f"\nPausing for 5 seconds before next URL...")
-            time.sleep(5)
+        try:
+            for i, future in enumerate(as_completed(futures), 1):
+                if future.result():
+                    successful += 1
+                else:
+                    failed += 1
+                logger.info(f"\nFinished {i}/{len(pending_urls)}: {futures[future]}")
+        except BaseException:
+            # Drop queued URLs so Ctrl-C stops the run instead of draining the queue
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
     
     # Summary
-    print(f"\n{'='*60}")
-    print("PROCESSING COMPLETE")
-    print(f"{'='*60}")
-    print(f"Total URLs in CSV: {len(urls)}")
-    print(f"Already completed: {len(completed_urls)}")
-    print(f"Previously failed: {len(failed_urls)}")
-    print(f"Processed this run: {len(pending_urls)}")
-    print(f"Successful: {successful}")
-    print(f"Failed: {failed}")
-    print(f"Transcripts saved to: transcripts/ folder")
-    print(f"Failed URLs saved to: youtube_url_failed.txt")
+    logger.info(
+        f"\n{'='*60}\n"
+        "PROCESSING COMPLETE\n"
+        f"{'='*60}\n"
+        f"Total URLs in CSV: {total_urls}\n"
+        f"Already completed: {len(completed_urls)}\n"
+        f"Previously failed: {len(failed_urls)}\n"
+        f"Transcripts already saved: {already_saved}\n"
+        f"Processed this run: {len(pending_urls)}\n"
+        f"Successful: {successful}\n"
+        f"Failed: {failed}\n"
+        f"Transcripts saved to: {transcripts_dir}/ folder\n"
+        f"Failed URLs saved to: {FAILED_FILE}"
+    )
+
+
+def _positive(value_type):
+    """Build an argparse type that only accepts values greater than zero."""
+    def parse(value: str):
+        try:
+            parsed = value_type(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid {value_type.__name__} value: {value!r}")
+        if parsed <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+        return parsed
+    return parse
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Fetch transcripts for every YouTube URL in youtube_url.csv using Supadata.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "Examples:\n"
+            "  python3 youtube_transcript_supadata.py\n"
+            "  python3 youtube_transcript_supadata.py --language es\n"
+            "  python3 youtube_transcript_supadata.py --workers 4 --rate 1\n"
+            "\nEnvironment Setup:\n"
+            "  1. Create a .env file with: SUPADATA_API_KEY=your_api_key_here\n"
+            "  2. Or set environment variable: export SUPADATA_API_KEY=your_api_key_here\n"
+            "  3. Get your API key from: https://supadata.ai/\n"
+            "\nNote: The script automatically processes youtube_url.csv\n"
+            "Default format: Plain text\n"
+            "Rate limiting: the request rate is automatically reduced when the API returns 429"
+        ),
+    )
+    parser.add_argument('--language', default='en',
+                        help="Language code (e.g., 'en', 'es', 'fr') - defaults to 'en'")
+    parser.add_argument('--workers', type=_positive(int), default=MAX_WORKERS,
+                        help=f"Number of transcripts fetched concurrently - defaults to {MAX_WORKERS}")
+    parser.add_argument('--rate', type=_positive(float), default=RATE_LIMIT,
+                        help=f"Maximum API requests per second - defaults to {RATE_LIMIT:g}")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Only show warnings and errors")
+    return parser.parse_args(argv)
 
 
 def main():
     """Main function to handle command line usage."""
-    # Parse options
-    language = 'en'
-    
-    for i, arg in enumerate(sys.argv):
-        if arg == '--language' and i + 1 < len(sys.argv):
-            language = sys.argv[i + 1]
-        elif arg == '--help' or arg == '-h':
-            print("Usage: python3 youtube_transcript_supadata.py [options]")
-            print("\nOptions:")
-            print("  --language <lang>     Language code (e.g., 'en', 'es', 'fr') - defaults to 'en'")
-
-            print("  --help, -h            Show this help message")
-            print("\nExamples:")
-            print("  python3 youtube_transcript_supadata.py")
-            print("  python3 youtube_transcript_supadata.py --language es")
-            print("\nEnvironment Setup:")
-            print("  1. Create a .env file with: SUPADATA_API_KEY=your_api_key_here")
-            print("  2. Or set environment variable: export SUPADATA_API_KEY=your_api_key_here")
-            print("  3. Get your API key from: https://supadata.ai/")
-            print("\nNote: The script automatically processes youtube_url.csv")
-            print("Default format: Plain text")
-            print("Rate limiting: 5-second pause between URLs to avoid API limits")
-            sys.exit(0)
-    
-    # Always process the CSV file by default
-    print("YouTube Transcript Fetcher - Processing youtube_url.csv")
-    print("=" * 60)
-    
-    # Ensure transcripts folder exists before starting
-    try:
-        ensure_transcripts_folder()
-    except Exception as e:
-        print(f"Critical error: Cannot create transcripts folder: {e}")
-        print("Please check permissions and try again.")
-        sys.exit(1)
+    args = parse_args()
     
-    process_csv_urls(language=language)
+    listener = setup_logging(args.quiet)
+    try:
+        # Always process the CSV file by default
+        logger.info("YouTube Transcript Fetcher - Processing youtube_url.csv\n" + "=" * 60)
+        
+        # Load the API key and build the shared client once for the whole run
+        client = create_client(load_environment(), pool_size=args.workers)
+        
+        # Ensure transcripts folder exists before starting
+        try:
+            transcripts_dir = ensure_transcripts_folder()
+        except Exception as e:
+            logger.critical(f"Critical error: Cannot create transcripts folder: {e}\n"
+                            "Please check permissions and try again.")
+            sys.exit(1)
+        
+        # Keep the tracking files open for the whole run
+        try:
+            tracking_log = TrackingLog()
+        except Exception as e:
+            logger.critical(f"Critical error: Cannot open tracking files: {e}")
+            sys.exit(1)
+        
+        with tracking_log:
+            process_csv_urls(client, transcripts_dir, tracking_log, language=args.language,
+                             workers=args.workers, rate=args.rate)
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":